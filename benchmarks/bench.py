@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""Benchmark harness for the Forge CLI.
+
+Generates synthetic repositories along several axes (file count, file size,
+history depth, binary vs. text, tag/branch count) and times the hot commands
+through the CLI, one fresh interpreter per command.
+
+Usage
+-----
+    python benchmarks/bench.py run [--scenario NAME ...] [--repeat N] [--out FILE]
+    python benchmarks/bench.py compare BASE.json NEW.json [--threshold 0.10]
+    python benchmarks/bench.py list
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import importlib.util
+from dataclasses import dataclass, asdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SRC = os.path.join(ROOT, 'src', 'forge')
+
+# Runs forge.cli() from a given source directory and, on Linux, dumps
+# /proc/self/io at exit so syscall and byte counts can be collected.
+RUNNER = r"""
+import atexit, os, sys
+sys.path.insert(0, sys.argv.pop(1))
+io_out = os.environ.get('FORGE_BENCH_IO')
+def _dump_io():
+    try:
+        with open('/proc/self/io') as src, open(io_out, 'w') as dst:
+            dst.write(src.read())
+    except OSError:
+        pass
+if io_out:
+    atexit.register(_dump_io)
+import forge
+forge.cli(prog_name='forge')
+"""
+
+COMMANDS = ['add --all', 'commit', 'status', 'diff', 'log', 'back', 'push', 'pull']
+
+
+@dataclass
+class Scenario:
+    name: str
+    files: int = 100
+    size: int = 4096
+    depth: int = 5
+    binary: bool = False
+    refs: int = 0
+    # Fraction of files changed between commits and before the timed run
+    churn: float = 0.1
+
+
+SCENARIOS = {s.name: s for s in [
+    Scenario('baseline'),
+    Scenario('many-files', files=5000, size=512),
+    Scenario('large-files', files=20, size=8 << 20),
+    Scenario('deep-history', files=50, depth=300),
+    Scenario('binary', files=200, size=64 << 10, binary=True),
+    Scenario('many-refs', files=100, refs=2000),
+]}
+
+
+def _payload(rng: random.Random, size: int, binary: bool) -> bytes:
+    if binary:
+        # Invalid UTF-8 lead byte keeps Forge on its binary code paths
+        return b'\xff' + rng.randbytes(max(size - 1, 0))
+    words = [b'forge', b'commit', b'object', b'index', b'branch', b'snapshot', b'\n']
+    out = bytearray()
+    while len(out) < size:
+        out += rng.choice(words) + b' '
+    return bytes(out[:size])
+
+
+def _write_tree(root: str, sc: Scenario, rng: random.Random, only=None):
+    for i in range(sc.files):
+        if only is not None and i not in only:
+            continue
+        rel = os.path.join(f'd{i % 32:02d}', f'f{i:06d}.{"bin" if sc.binary else "txt"}')
+        path = os.path.join(root, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as fh:
+            fh.write(_payload(rng, sc.size, sc.binary))
+
+
+def _churn(sc: Scenario, rng: random.Random) -> set:
+    n = max(1, int(sc.files * sc.churn))
+    return set(rng.sample(range(sc.files), min(n, sc.files)))
+
+
+def _load_forge(src: str):
+    spec = importlib.util.spec_from_file_location('forge_bench_setup', os.path.join(src, 'forge.py'))
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def _setup(mod, sc: Scenario, repo: str, rng: random.Random):
+    """Build the repository in-process; setup is not part of the measurement."""
+    cwd = os.getcwd()
+    os.chdir(repo)
+    try:
+        def call(*args):
+            with contextlib.redirect_stdout(io.StringIO()):
+                mod.cli.main(args=list(args), prog_name='forge', standalone_mode=False)
+        call('init')
+        _write_tree(repo, sc, rng)
+        for i in range(sc.depth):
+            if i:
+                _write_tree(repo, sc, rng, only=_churn(sc, rng))
+            call('add', '--all')
+            call('commit', f'rev {i}')
+        head = mod.Forge()._read_head()
+        for i in range(sc.refs):
+            folder = 'tags' if i % 2 else 'branches'
+            with open(os.path.join('.forge', folder, f'r{i:05d}'), 'w', encoding='utf-8') as fh:
+                fh.write(head + '\n')
+    finally:
+        os.chdir(cwd)
+
+
+def _run_cli(src: str, args: list, cwd: str) -> dict:
+    with tempfile.NamedTemporaryFile(delete=False) as tmp:
+        io_path = tmp.name
+    env = dict(os.environ, FORGE_BENCH_IO=io_path)
+    # stderr goes to a file, not a pipe: nobody reads a pipe while we block in wait4
+    with open(os.devnull, 'wb') as devnull, tempfile.TemporaryFile() as err:
+        start = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, '-c', RUNNER, src, *args],
+                                cwd=cwd, env=env, stdout=devnull, stderr=err)
+        # wait4 gives the child's own rusage, unlike RUSAGE_CHILDREN
+        _, status, usage = os.wait4(proc.pid, 0)
+        wall = time.perf_counter() - start
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        err.seek(0)
+        stderr = err.read().decode('utf-8', errors='replace')
+    if proc.returncode != 0:
+        raise RuntimeError(f"forge {' '.join(args)} failed ({proc.returncode}): {stderr.strip()}")
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss_kib = usage.ru_maxrss // 1024 if sys.platform == 'darwin' else usage.ru_maxrss
+    result = {
+        'wall_s': wall,
+        'user_s': usage.ru_utime,
+        'sys_s': usage.ru_stime,
+        'peak_rss_kib': rss_kib,
+        'blocks_in': usage.ru_inblock,
+        'blocks_out': usage.ru_oublock,
+    }
+    try:
+        with open(io_path) as fh:
+            for line in fh:
+                key, _, value = line.partition(':')
+                if key in ('syscr', 'syscw', 'rchar', 'wchar', 'read_bytes', 'write_bytes'):
+                    result[key] = int(value)
+    finally:
+        os.unlink(io_path)
+    return result
+
+
+def run_scenario(sc: Scenario, src: str, repeat: int, seed: int) -> dict:
+    mod = _load_forge(src)
+    samples = {cmd: [] for cmd in COMMANDS}
+    for r in range(repeat):
+        rng = random.Random(seed + r)
+        work = tempfile.mkdtemp(prefix=f'forge-bench-{sc.name}-')
+        try:
+            repo = os.path.join(work, 'repo')
+            remote = os.path.join(work, 'remote')
+            clone = os.path.join(work, 'clone')
+            os.makedirs(repo)
+            os.makedirs(clone)
+            _setup(mod, sc, repo, rng)
+
+            _write_tree(repo, sc, rng, only=_churn(sc, rng))
+            samples['add --all'].append(_run_cli(src, ['add', '--all'], repo))
+            samples['commit'].append(_run_cli(src, ['commit', 'bench'], repo))
+            _write_tree(repo, sc, rng, only=_churn(sc, rng))
+            samples['status'].append(_run_cli(src, ['status'], repo))
+            samples['diff'].append(_run_cli(src, ['diff'], repo))
+            samples['log'].append(_run_cli(src, ['log'], repo))
+            samples['push'].append(_run_cli(src, ['push', remote], repo))
+            _run_cli(src, ['init'], clone)
+            samples['pull'].append(_run_cli(src, ['pull', remote], clone))
+            samples['back'].append(_run_cli(src, ['back', 'rev 0'], repo))
+        finally:
+            shutil.rmtree(work, ignore_errors=True)
+    return {
+        'scenario': asdict(sc),
+        'commands': {cmd: _summarize(runs) for cmd, runs in samples.items()},
+    }
+
+
+def _summarize(runs: list) -> dict:
+    """Median of every metric across repeats."""
+    out = {}
+    for key in runs[0]:
+        values = sorted(r[key] for r in runs if key in r)
+        out[key] = values[len(values) // 2]
+    out['runs'] = len(runs)
+    return out
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def cmd_run(args) -> int:
+    names = args.scenario or ['baseline']
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        print(f"unknown scenario(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    report = {
+        'revision': _git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'src': os.path.abspath(args.src),
+        'repeat': args.repeat,
+        'results': {},
+    }
+    for name in names:
+        print(f'[bench] {name} ...', file=sys.stderr)
+        report['results'][name] = run_scenario(SCENARIOS[name], args.src, args.repeat, args.seed)
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as fh:
+            fh.write(text + '\n')
+    else:
+        print(text)
+    return 0
+
+
+def cmd_compare(args) -> int:
+    with open(args.base, encoding='utf-8') as fh:
+        base = json.load(fh)
+    with open(args.new, encoding='utf-8') as fh:
+        new = json.load(fh)
+    regressions = 0
+    print(f"{'scenario':<14} {'command':<10} {'metric':<13} {'base':>12} {'new':>12} {'change':>8}")
+    for name, result in new['results'].items():
+        base_cmds = base['results'].get(name, {}).get('commands', {})
+        for cmd, metrics in result['commands'].items():
+            old = base_cmds.get(cmd)
+            if not old:
+                continue
+            for metric in args.metric:
+                a, b = old.get(metric), metrics.get(metric)
+                if not a or b is None:
+                    continue
+                change = (b - a) / a
+                flag = ''
+                if change > args.threshold:
+                    regressions += 1
+                    flag = '  REGRESSION'
+                print(f'{name:<14} {cmd:<10} {metric:<13} {a:>12.4g} {b:>12.4g} {change:>+7.1%}{flag}')
+    if regressions:
+        print(f'{regressions} regression(s) above {args.threshold:.0%}', file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the Forge CLI on synthetic repositories.')
+    sub = parser.add_subparsers(dest='action', required=True)
+
+    run = sub.add_parser('run', help='run scenarios and write a JSON report')
+    run.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                     help='scenario to run (repeatable, default: baseline)')
+    run.add_argument('--repeat', type=int, default=3, help='repetitions per scenario (median is reported)')
+    run.add_argument('--seed', type=int, default=0, help='random seed for generated content')
+    run.add_argument('--src', default=DEFAULT_SRC, help='directory containing forge.py to benchmark')
+    run.add_argument('--out', help='write the JSON report here instead of stdout')
+    run.set_defaults(func=cmd_run)
+
+    compare = sub.add_parser('compare', help='compare two JSON reports')
+    compare.add_argument('base')
+    compare.add_argument('new')
+    compare.add_argument('--threshold', type=float, default=0.10,
+                         help='relative increase counted as a regression (default: 0.10)')
+    compare.add_argument('--metric', action='append', default=None,
+                         help='metric to compare (repeatable, default: wall_s and peak_rss_kib)')
+    compare.set_defaults(func=cmd_compare)
+
+    lst = sub.add_parser('list', help='list available scenarios')
+    lst.set_defaults(func=lambda _: print('\n'.join(
+        f'{s.name:<14} {asdict(s)}' for s in SCENARIOS.values())) or 0)
+
+    args = parser.parse_args(argv)
+    if getattr(args, 'metric', False) is None:
+        args.metric = ['wall_s', 'peak_rss_kib']
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,15 +1,37 @@
 #!/usr/bin/env python3
 import os
+import posixpath
 import hashlib
 import json
 import click
 import shutil
+import stat
 import difflib
+import asyncio
+import bisect
+import time
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
 # Global quiet flag controlled by CLI
 QUIET = False
 
+# Length of a full SHA-1 hex digest and the shortest accepted abbreviation
+HASH_LEN = 40
+MIN_PREFIX = 4
+
+# Read size for streaming file hashes
+CHUNK_SIZE = 1 << 20
+
+_HEX_DIGITS = frozenset('0123456789abcdef')
+
+def _is_hex(s: str) -> bool:
+    return bool(s) and set(s) <= _HEX_DIGITS
+
+class ResolveError(Exception):
+    """Raised when a revision or object spec cannot be resolved uniquely."""
+
 def secho(message, fg=None, bold=False, err=False, force=False):
     """Wrapper around click.secho that respects the global QUIET flag.
 
@@ -19,6 +41,195 @@ def secho(message, fg=None, bold=False, err=False, force=False):
         return
     click.secho(message, fg=fg, bold=bold, err=err)
 
+class Output:
+    """Buffered stdout writer for large listings and diffs.
+
+    Lines are collected and written with one `click.echo` per ~64 KiB instead
+    of one call per line. Styling is applied only when stdout is a terminal
+    and never with `porcelain=True`. Like `secho`, lines are dropped when
+    QUIET is set unless `force=True`. Use as a context manager so the
+    buffer is flushed on exit.
+    """
+    def __init__(self, porcelain: bool = False, limit: int = 1 << 16):
+        self.stream = click.get_text_stream('stdout')
+        self.styled = not porcelain and self.stream.isatty()
+        self.limit = limit
+        self._parts = []
+        self._size = 0
+
+    def line(self, message: str = '', fg=None, bold=False, force=False):
+        if QUIET and not force:
+            return
+        if self.styled and (fg or bold):
+            message = click.style(message, fg=fg, bold=bold)
+        self._parts.append(message)
+        self._parts.append('\n')
+        self._size += len(message) + 1
+        if self._size >= self.limit:
+            self.flush()
+
+    def lines(self, messages, fg=None, bold=False, force=False):
+        for message in messages:
+            self.line(message, fg=fg, bold=bold, force=force)
+
+    def flush(self):
+        if not self._parts:
+            return
+        with phase('output'):
+            click.echo(''.join(self._parts), file=self.stream, nl=False)
+        self._parts.clear()
+        self._size = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+        return False
+
+class PathSpec:
+    """Set of repo-relative path prefixes that limits an operation.
+
+    `PathSpec(None)` (or a prefix of `.`) matches everything, `PathSpec([])`
+    matches nothing. A prefix matches itself and everything below it.
+    """
+    def __init__(self, prefixes=None):
+        self.prefixes = None
+        if prefixes is None:
+            return
+        norm = set()
+        for p in prefixes:
+            p = posixpath.normpath(p.replace('\\', '/').strip('/'))
+            if p == '.':
+                return
+            norm.add(p)
+        # drop prefixes already covered by a shorter one
+        self.prefixes = sorted(p for p in norm if not any(a in norm for a in _ancestors(p)))
+        self._set = set(self.prefixes)
+        self._dirs = {a for p in self.prefixes for a in _ancestors(p)}
+
+    @property
+    def everything(self) -> bool:
+        return self.prefixes is None
+
+    def matches(self, rel: str) -> bool:
+        if self.prefixes is None:
+            return True
+        if rel in self._set:
+            return True
+        return any(a in self._set for a in _ancestors(rel))
+
+    def wants_dir(self, rel_dir: str) -> bool:
+        """True if the walk must descend into `rel_dir`."""
+        return self.matches(rel_dir) or rel_dir in self._dirs
+
+    def select(self, keys: list) -> list:
+        """Entries of the sorted list `keys` matched by this spec, via bisect per prefix."""
+        if self.prefixes is None:
+            return list(keys)
+        out = []
+        for p in self.prefixes:
+            i = bisect.bisect_left(keys, p)
+            if i < len(keys) and keys[i] == p:
+                out.append(p)
+            lo = bisect.bisect_left(keys, p + '/')
+            hi = bisect.bisect_left(keys, p + '0', lo)  # '0' sorts right after '/'
+            out.extend(keys[lo:hi])
+        out.sort()
+        return out
+
+    def intersect(self, other: 'PathSpec') -> 'PathSpec':
+        if self.prefixes is None:
+            return other
+        if other.prefixes is None:
+            return self
+        keep = [p for p in self.prefixes if other.matches(p)]
+        keep += [p for p in other.prefixes if self.matches(p)]
+        return PathSpec(keep)
+
+def _ancestors(rel: str):
+    """Proper ancestor directories of `rel`: 'a/b/c' -> 'a', 'a/b'."""
+    i = rel.find('/')
+    while i != -1:
+        yield rel[:i]
+        i = rel.find('/', i + 1)
+
+# Active profiler, set by the global --profile/--trace-json/--cprofile options.
+# Stays None otherwise so `phase` and `count` cost a single global lookup.
+PROFILER = None
+
+_NULL_PHASE = contextlib.nullcontext()
+
+class Profiler:
+    """Collects per-phase timings and counters for one CLI invocation.
+
+    Attributes
+    ----------
+    phases : dict
+        Phase name -> [calls, inclusive seconds]
+    counters : dict
+        Counter name -> value (files_stat, bytes_hashed, objects_read, ...)
+    events : list
+        `(name, start, duration)` in seconds since start, for the Chrome trace
+    """
+    MAX_EVENTS = 200_000
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.phases = {}
+        self.counters = {}
+        self.events = []
+        self.dropped_events = 0
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            entry = self.phases.setdefault(name, [0, 0.0])
+            entry[0] += 1
+            entry[1] += duration
+            if len(self.events) < self.MAX_EVENTS:
+                self.events.append((name, start - self.origin, duration))
+            else:
+                self.dropped_events += 1
+
+    def summary(self) -> str:
+        total = time.perf_counter() - self.origin
+        lines = [f"--- Profil ({total * 1000:.1f} ms) ---"]
+        for name, (calls, seconds) in sorted(self.phases.items(), key=lambda kv: -kv[1][1]):
+            lines.append(f"  {name:<20} {seconds * 1000:10.2f} ms  {calls:>8}x")
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"  {name:<20} {value:>13}")
+        if self.dropped_events:
+            lines.append(f"  ({self.dropped_events} Trace-Events verworfen)")
+        return '\n'.join(lines)
+
+    def write_trace(self, path: str):
+        """Write a Chrome trace (chrome://tracing, Perfetto) as JSON."""
+        pid = os.getpid()
+        events = [
+            {"name": name, "ph": "X", "ts": start * 1e6, "dur": duration * 1e6, "pid": pid, "tid": 0}
+            for name, start, duration in self.events
+        ]
+        end = (time.perf_counter() - self.origin) * 1e6
+        events.append({"name": "counters", "ph": "C", "ts": end, "pid": pid, "tid": 0, "args": dict(self.counters)})
+        with open(path, 'w', encoding='utf-8') as fh:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, fh)
+
+def phase(name: str):
+    """Context manager timing `name` when profiling is enabled, no-op otherwise."""
+    if PROFILER is None:
+        return _NULL_PHASE
+    return PROFILER.phase(name)
+
+def count(name: str, n: int = 1):
+    """Add `n` to profiling counter `name` when profiling is enabled."""
+    if PROFILER is not None:
+        PROFILER.counters[name] = PROFILER.counters.get(name, 0) + n
+
 class Forge:
     """
     Parameters
@@ -53,6 +264,12 @@ class Forge:
 
     _save_index()
         Save Index of Repository
+
+    resolve(spec, kind)
+        Resolve HEAD, refs, tags, short hashes and `~N` to a full hash
+
+    scope(pathspecs)
+        PathSpec from `.forge/sparse` narrowed by command-line paths
     """
     def __init__(self, base_path: str = '.forge'):
         self.base_path = base_path
@@ -62,6 +279,8 @@ class Forge:
         self.head_path = os.path.join(self.base_path, "HEAD")
         self.tags_path = os.path.join(self.base_path, "tags")
         self.branches_path = os.path.join(self.base_path, "branches")
+        self.sparse_path = os.path.join(self.base_path, "sparse")
+        self._hash_lists = {}
 
     def ensure_repo(self):
         if not os.path.exists(self.base_path):
@@ -80,8 +299,18 @@ class Forge:
         return hashlib.sha1(str(data).encode("utf-8")).hexdigest()
 
     def _hash_bytes(self, data: bytes) -> str:
+        count('bytes_hashed', len(data))
         return hashlib.sha1(data).hexdigest()
 
+    def _hash_path(self, path: str) -> str:
+        """Hash a file's bytes in fixed-size chunks without loading it whole."""
+        h = hashlib.sha1()
+        with open(path, 'rb') as fh:
+            while chunk := fh.read(CHUNK_SIZE):
+                h.update(chunk)
+                count('bytes_hashed', len(chunk))
+        return h.hexdigest()
+
     def _relpath(self, path: str) -> str:
         """Normalize a path to be relative to repo root, with forward slashes for stability."""
         p = os.path.relpath(path, start=os.getcwd())
@@ -91,15 +320,95 @@ class Forge:
         return os.path.abspath(rel)
 
     def _read_json(self, path: str, default):
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return default
+        with phase('json.read'):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except FileNotFoundError:
+                return default
+        count('json_reads')
+        return data
 
     def _write_json(self, path: str, data):
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, sort_keys=True)
+        with phase('json.write'):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, sort_keys=True)
+        count('json_writes')
+
+    def _read_sparse(self) -> list:
+        """Prefixes from `.forge/sparse`, one per line; `#` starts a comment."""
+        try:
+            with open(self.sparse_path, 'r', encoding='utf-8') as fh:
+                lines = [line.split('#', 1)[0].strip() for line in fh]
+        except FileNotFoundError:
+            return []
+        # hand-edited lines may read `./src` or `src/`
+        return [posixpath.normpath(line.replace('\\', '/')).strip('/') for line in lines if line]
+
+    def scope(self, pathspecs=()) -> PathSpec:
+        """Paths an operation may touch: the sparse prefixes narrowed by `pathspecs`."""
+        sparse = self._read_sparse()
+        spec = PathSpec(sparse) if sparse else PathSpec()
+        if pathspecs:
+            spec = spec.intersect(PathSpec([self._relpath(p) for p in pathspecs]))
+        return spec
+
+    def _walk_worktree(self, skip_hidden: bool = False, scope: PathSpec = None) -> list:
+        """Paths of all files below the working directory, excluding `.forge`.
+
+        With `skip_hidden`, directories and files starting with `.` are skipped too.
+        With `scope`, directories outside it are not entered at all.
+        """
+        paths = []
+        cwd = os.getcwd()
+        forge_dir = os.path.abspath(self.base_path)
+        limited = scope is not None and not scope.everything
+        with phase('walk'):
+            for root, dirs, files in os.walk(cwd):
+                if skip_hidden:
+                    # skip directories starting with .
+                    if any(part.startswith('.') for part in root.split(os.sep)):
+                        continue
+                    dirs[:] = [d for d in dirs if not d.startswith('.')]
+                else:
+                    # .forge ignorieren
+                    if self.base_path in root:
+                        continue
+                    dirs[:] = [d for d in dirs if os.path.join(root, d) != forge_dir]
+                if limited:
+                    rel_root = self._relpath(root)
+                    rel_root = '' if rel_root == '.' else rel_root + '/'
+                    dirs[:] = [d for d in dirs if scope.wants_dir(rel_root + d)]
+                    files = [name for name in files if scope.matches(rel_root + name)]
+                count('files_walked', len(files))
+                for name in files:
+                    path = os.path.join(root, name)
+                    if skip_hidden and any(part.startswith('.') for part in path.split(os.sep)):
+                        continue
+                    if not skip_hidden and self.base_path in path:
+                        continue
+                    paths.append(path)
+        return paths
+
+    def _read_object(self, obj_hash: str) -> bytes:
+        with phase('object.read'):
+            with open(os.path.join(self.objects_path, obj_hash), 'rb') as fh:
+                data = fh.read()
+        count('objects_read')
+        return data
+
+    def _write_object(self, obj_hash: str, data: bytes) -> bool:
+        """Store `data` under `obj_hash` unless it already exists; True if written."""
+        obj_path = os.path.join(self.objects_path, obj_hash)
+        count('files_stat')
+        if os.path.exists(obj_path):
+            count('object_cache_hits')
+            return False
+        with phase('object.write'):
+            with open(obj_path, 'wb') as fh:
+                fh.write(data)
+        count('objects_written')
+        return True
 
     def _get_index(self):
         return self._read_json(self.index_path, {})
@@ -128,17 +437,215 @@ class Forge:
         path = os.path.join(self.commits_path, commit_hash)
         self._write_json(path, data)
 
+    def _sorted_hashes(self, folder: str) -> list:
+        """Sorted list of hash names in `folder`, listed once per instance."""
+        cache = self._hash_lists
+        if folder in cache:
+            count('hash_list_cache_hits')
+        else:
+            try:
+                names = os.listdir(folder)
+            except FileNotFoundError:
+                names = []
+            cache[folder] = sorted(n for n in names if _is_hex(n) and len(n) == HASH_LEN)
+        return cache[folder]
+
+    def _match_prefix(self, prefix: str, folder: str) -> list:
+        """All hashes in `folder` starting with `prefix` (bisect on the sorted list)."""
+        hashes = self._sorted_hashes(folder)
+        lo = bisect.bisect_left(hashes, prefix)
+        hi = bisect.bisect_left(hashes, prefix + 'g', lo)  # 'g' sorts after every hex digit
+        return hashes[lo:hi]
+
+    def _read_ref(self, folder: str, name: str):
+        path = os.path.join(folder, name)
+        if os.path.dirname(os.path.normpath(path)) != os.path.normpath(folder):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as fh:
+                return fh.read().strip() or None
+        except (FileNotFoundError, IsADirectoryError):
+            return None
+
+    def _expand_hash(self, name: str, folder: str, spec: str) -> str:
+        """Expand a full or abbreviated hash to an existing entry of `folder`."""
+        name = name.lower()
+        if not _is_hex(name) or len(name) < MIN_PREFIX:
+            raise ResolveError(f"Unbekannte Revision '{spec}'.")
+        if len(name) == HASH_LEN:
+            # Full hash: a single stat, no directory listing
+            count('files_stat')
+            if os.path.isfile(os.path.join(folder, name)):
+                return name
+            raise ResolveError(f"Unbekannte Revision '{spec}'.")
+        matches = self._match_prefix(name, folder)
+        if not matches:
+            raise ResolveError(f"Unbekannte Revision '{spec}'.")
+        if len(matches) > 1:
+            shown = ', '.join(m[:len(name) + 2] for m in matches[:5])
+            raise ResolveError(f"Mehrdeutiger Kurz-Hash '{name}': {shown}")
+        return matches[0]
+
+    def resolve(self, spec: str, kind: str = 'commit') -> str:
+        """Resolve a revision or object spec to a full hash.
+
+        Parameters
+        ----------
+        spec : str
+            ``HEAD``, a tag or branch name, a full or abbreviated hash
+            (at least ``MIN_PREFIX`` hex digits), optionally followed by ``~N``.
+            Ref contents are expanded the same way, so the result is always
+            the full hash of an existing commit or object.
+        kind : str | default = 'commit'
+            ``'commit'`` or ``'object'``. Refs and ``~N`` only apply to commits.
+
+        Raises
+        ------
+        ResolveError
+            If the spec is unknown, ambiguous or walks past the root commit.
+        """
+        base, steps = spec, 0
+        if kind == 'commit' and '~' in spec:
+            base, _, n = spec.rpartition('~')
+            if not n:
+                steps = 1
+            elif n.isdigit():
+                steps = int(n)
+            else:
+                raise ResolveError(f"Ungültige Revision '{spec}'.")
+        folder = self.commits_path if kind == 'commit' else self.objects_path
+
+        target = None
+        if kind == 'commit':
+            if base == 'HEAD':
+                target = self._read_head()
+                if not target:
+                    raise ResolveError('Kein HEAD-Commit vorhanden.')
+            else:
+                target = self._read_ref(self.tags_path, base) or self._read_ref(self.branches_path, base)
+            if target is not None:
+                # Refs written before the resolver existed may hold short or stale hashes
+                target = self._expand_hash(target, folder, f"{base} -> {target}")
+        if target is None:
+            target = self._expand_hash(base, folder, spec)
+
+        for _ in range(steps):
+            data = self._read_commit(target)
+            if not data or not data.get('parent'):
+                raise ResolveError(f"Revision '{spec}' reicht über den ersten Commit hinaus.")
+            target = data['parent']
+        return target
+
+    def _refs(self) -> list:
+        """`(label, raw target)` for HEAD, every branch and every tag."""
+        head = self._read_head()
+        refs = [('HEAD', head)] if head else []
+        for label, folder in (('branch', self.branches_path), ('tag', self.tags_path)):
+            if not os.path.isdir(folder):
+                continue
+            for name in sorted(os.listdir(folder)):
+                refs.append((f"{label}:{name}", self._read_ref(folder, name)))
+        return refs
+
+    def _walk_commits(self, roots):
+        """Yield `(commit_hash, data)` for every commit reachable from `roots`.
+
+        Commits are read one at a time; only the set of visited hashes is
+        kept in memory. Raises ValueError for a commit file that cannot be
+        parsed, since its file references are unknown.
+        """
+        seen = set()
+        stack = list(roots)
+        while stack:
+            current = stack.pop()
+            if not current or current in seen:
+                continue
+            seen.add(current)
+            try:
+                data = self._read_commit(current)
+            except (OSError, ValueError) as e:
+                raise ValueError(f"Commit {current} ist beschädigt: {e}") from None
+            if data is None:
+                continue
+            problem = _commit_problem(data)
+            if problem:
+                raise ValueError(f"Commit {current} ist beschädigt: {problem}")
+            yield current, data
+            stack.append(data.get('parent'))
+
+    def _mark_reachable(self) -> set:
+        """Return the object hashes referenced by any commit or by the index.
+
+        Every commit file is a root: `back` finds commits by message among all
+        of them, so a commit is reachable even when no ref points to it.
+        """
+        objects = set(self._get_index().values())
+        for _, data in self._walk_commits(self._sorted_hashes(self.commits_path)):
+            objects.update(data['files'].values())
+        return objects
+
+def _commit_problem(data) -> str:
+    """Describe what is structurally wrong with parsed commit `data`, or '' if nothing."""
+    if not isinstance(data, dict):
+        return "kein JSON-Objekt"
+    files = data.get('files', {})
+    if not isinstance(files, dict) or not all(isinstance(k, str) and isinstance(v, str) for k, v in files.items()):
+        return "'files' ist keine Zuordnung Pfad -> Hash"
+    parent = data.get('parent')
+    if parent is not None and not isinstance(parent, str):
+        return "'parent' ist weder null noch ein Hash"
+    return ''
+
+def _resolve_or_report(f: Forge, spec: str, kind: str = 'commit'):
+    """Resolve `spec` via `Forge.resolve`, printing the error and returning None on failure."""
+    try:
+        return f.resolve(spec, kind)
+    except ResolveError as e:
+        secho(f"[Forge] >> {e}", fg='red')
+        return None
+
 # --- CLI Definition mit Click ---
 
 @click.group()
 @click.option('--quiet', '-q', is_flag=True, help='Suppress non-essential output')
+@click.option('--profile', is_flag=True, help='Print per-phase timings and counters to stderr')
+@click.option('--trace-json', type=click.Path(dir_okay=False), help='Write a Chrome trace (JSON) to this file')
+@click.option('--cprofile', 'cprofile_path', type=click.Path(dir_okay=False), help='Write cProfile stats to this file')
 @click.pass_context
-def cli(ctx, quiet):
+def cli(ctx, quiet, profile, trace_json, cprofile_path):
     """Forge - Version Control"""
     global QUIET
     QUIET = quiet
     ctx.ensure_object(dict)
     ctx.obj['quiet'] = quiet
+    if profile or trace_json or cprofile_path:
+        _start_profiling(ctx, profile, trace_json, cprofile_path)
+
+def _start_profiling(ctx, summary, trace_json, cprofile_path):
+    """Enable the global profiler and report when the command's context closes."""
+    global PROFILER
+    PROFILER = Profiler()
+    prof = None
+    if cprofile_path:
+        import cProfile
+        prof = cProfile.Profile()
+        prof.enable()
+    command_phase = PROFILER.phase(f"command:{ctx.invoked_subcommand}")
+    command_phase.__enter__()
+
+    def report():
+        global PROFILER
+        command_phase.__exit__(None, None, None)
+        if prof is not None:
+            prof.disable()
+            prof.dump_stats(cprofile_path)
+        if trace_json:
+            PROFILER.write_trace(trace_json)
+        if summary:
+            secho(PROFILER.summary(), err=True, force=True)
+        PROFILER = None
+
+    ctx.call_on_close(report)
 
 @cli.command()
 def init():
@@ -168,36 +675,26 @@ def add(add_all, files):
     # Sammle Kandidaten
     candidates = []
     if add_all:
-        for root, dirs, fnames in os.walk(os.getcwd()):
-            # .forge ignorieren
-            if f.base_path in root:
-                continue
-            # dirs filtern: .forge auslassen
-            dirs[:] = [d for d in dirs if os.path.join(root, d) != os.path.abspath(f.base_path)]
-            for name in fnames:
-                path = os.path.join(root, name)
-                if f.base_path in path:
-                    continue
-                candidates.append(path)
+        candidates = f._walk_worktree(scope=f.scope())
     candidates.extend(files)
 
     added = 0
     for path in candidates:
+        count('files_stat')
         if os.path.isdir(path):
             continue
         if f.base_path in os.path.abspath(path):
             continue
         try:
-            with open(path, 'rb') as stream:
-                content = stream.read()
+            with phase('file.read'):
+                with open(path, 'rb') as stream:
+                    content = stream.read()
         except Exception as e:
             secho(f"[Forge] >> Konnte {path} nicht lesen: {e}", fg='red')
             continue
-        file_hash = f._hash_bytes(content)
-        obj_path = os.path.join(f.objects_path, file_hash)
-        if not os.path.exists(obj_path):
-            with open(obj_path, 'wb') as obj:
-                obj.write(content)
+        with phase('hash'):
+            file_hash = f._hash_bytes(content)
+        f._write_object(file_hash, content)
         index[f._relpath(path)] = file_hash
         added += 1
 
@@ -230,8 +727,17 @@ def commit(message):
 # ... (vorheriger Code bleibt gleich)
 
 @cli.command()
-def status():
-    """Zeigt den aktuellen Zustand: staged, geändert, gelöscht, untracked."""
+@click.option('--porcelain', is_flag=True, help='Stabiles, maschinenlesbares Format ohne Farben')
+@click.argument('paths', nargs=-1, type=click.Path())
+def status(porcelain, paths):
+    """Zeigt den aktuellen Zustand: staged, geändert, gelöscht, untracked.
+
+    Mit `paths` (und einer Sparse-Datei `.forge/sparse`) werden nur Pfade unter
+    diesen Präfixen geprüft und durchsucht.
+
+    Mit `--porcelain` wird pro Pfad eine Zeile `<Code> <Pfad>` ausgegeben,
+    mit den Codes `S` (staged), `M` (geändert), `D` (gelöscht) und `?` (untracked).
+    """
     f = Forge()
     f.ensure_repo()
     index = f._get_index()
@@ -240,69 +746,74 @@ def status():
     modified = []
     deleted = []
     untracked = []
+    scope = f.scope(paths)
 
     # Check indexed files against working tree
-    for rel, obj_hash in index.items():
+    for rel in scope.select(sorted(index)):
+        obj_hash = index[rel]
         abs_path = f._abspath(rel)
+        count('files_stat')
         if not os.path.exists(abs_path):
             deleted.append(rel)
             continue
         try:
-            with open(abs_path, 'rb') as fh:
-                data = fh.read()
+            with phase('file.read'):
+                with open(abs_path, 'rb') as fh:
+                    data = fh.read()
         except Exception:
             continue
-        h = f._hash_bytes(data)
+        with phase('hash'):
+            h = f._hash_bytes(data)
         if h != obj_hash:
             modified.append(rel)
         else:
             staged.append(rel)
 
     # Find untracked files
-    for root, dirs, files in os.walk(os.getcwd()):
-        # skip directories starting with .
-        if any(part.startswith('.') for part in root.split(os.sep)):
-            continue
-        # Remove directories starting with . from traversal
-        dirs[:] = [d for d in dirs if not d.startswith('.')]
-        for name in files:
-            path = os.path.join(root, name)
-            if any(part.startswith('.') for part in path.split(os.sep)):
-                continue
-            rel = f._relpath(path)
-            if rel not in index:
-                untracked.append(rel)
+    for path in f._walk_worktree(skip_hidden=True, scope=scope):
+        rel = f._relpath(path)
+        if rel not in index:
+            untracked.append(rel)
+
+    sections = [
+        ('S', "Staged:", 'green', staged),
+        ('M', "Geändert:", 'yellow', modified),
+        ('D', "Gelöscht:", 'red', deleted),
+        ('?', "Untracked:", 'blue', untracked),
+    ]
+    if porcelain:
+        with Output(porcelain=True) as out:
+            for code, _, _, paths in sections:
+                out.lines((f"{code} {p}" for p in sorted(paths)), force=True)
+        return
 
     if not any([staged, modified, deleted, untracked]):
         secho("[Forge] >> Nichts zu tun. Arbeitsverzeichnis sauber.", fg="green", bold=True)
         return
 
-    if staged:
-        secho("Staged:", fg='green', bold=True)
-        for p in sorted(staged):
-            secho(f"  {p}")
-    if modified:
-        secho("Geändert:", fg='yellow', bold=True)
-        for p in sorted(modified):
-            secho(f"  {p}")
-    if deleted:
-        secho("Gelöscht:", fg='red', bold=True)
-        for p in sorted(deleted):
-            secho(f"  {p}")
-    if untracked:
-        secho("Untracked:", fg='blue', bold=True)
-        for p in sorted(untracked):
-            secho(f"  {p}")
+    with Output() as out:
+        for _, title, color, paths in sections:
+            if paths:
+                out.line(title, fg=color, bold=True)
+                out.lines(f"  {p}" for p in sorted(paths))
 
 @cli.command()
 @click.argument('remote_path', type=click.Path())
 def push(remote_path):
     """Überträgt alle Daten in ein Remote-Verzeichnis.
 
-    Robustheit: überspringt fehlende lokale Ordner (z. B. wenn keine Objekte vorhanden sind)."""
+    Robustheit: überspringt fehlende lokale Ordner (z. B. wenn keine Objekte vorhanden sind).
+    Mit `forge://host:port` oder `forge+unix:///pfad` werden nur fehlende Objekte
+    und Commits an einen `forge serve`-Server gesendet."""
     f = Forge()
     f.ensure_repo()
-    
+
+    remote = _parse_remote_url(remote_path)
+    if remote:
+        if not _remote_sync(f, remote, 'push'):
+            exit(1)
+        return
+
     if not os.path.exists(remote_path):
         os.makedirs(remote_path)
         
@@ -315,21 +826,31 @@ def push(remote_path):
         if not os.path.exists(src):
             continue
 
-        if os.path.exists(dst):
-            shutil.rmtree(dst)
-        shutil.copytree(src, dst)
+        with phase('copy'):
+            if os.path.exists(dst):
+                shutil.rmtree(dst)
+            shutil.copytree(src, dst)
         
     secho(f"[Forge] >> Repository erfolgreich nach {remote_path} geschoben.", fg="green", bold=True)
 
 @cli.command()
-@click.argument('remote_path', type=click.Path(exists=True))
+@click.argument('remote_path', type=click.Path())
 def pull(remote_path):
     """
-    Hole Dateien aus Remote-Repository
+    Hole Dateien aus Remote-Repository (Verzeichnis oder `forge://host:port`)
     """
     f = Forge()
     f.ensure_repo()
-    
+
+    remote = _parse_remote_url(remote_path)
+    if remote:
+        if not _remote_sync(f, remote, 'pull'):
+            exit(1)
+        return
+    if not os.path.exists(remote_path):
+        secho(f"[Forge] >> Remote-Verzeichnis {remote_path} existiert nicht.", fg='red', bold=True, force=True)
+        exit(1)
+
     # Hole Objekte und Commits vom Remote
     for folder in ["objects", "commits"]:
         src = os.path.join(remote_path, folder)
@@ -343,11 +864,14 @@ def pull(remote_path):
         os.makedirs(dst, exist_ok=True)
 
         # Wir fügen nur neue Dateien hinzu, statt zu löschen
-        for item in os.listdir(src):
-            s = os.path.join(src, item)
-            d = os.path.join(dst, item)
-            if not os.path.exists(d):
-                shutil.copy2(s, d)
+        with phase('copy'):
+            for item in os.listdir(src):
+                s = os.path.join(src, item)
+                d = os.path.join(dst, item)
+                count('files_stat')
+                if not os.path.exists(d):
+                    shutil.copy2(s, d)
+                    count('files_copied')
                 
     secho("[Forge] >> Neue Daten erfolgreich gezogen.", fg="green", bold=True)
 
@@ -356,6 +880,9 @@ def pull(remote_path):
 def back(message):
     """
     Setze Repository auf Snapshot mit bestimmter Nachricht zurück.
+
+    Ist `.forge/sparse` gesetzt, werden nur Dateien unter diesen Präfixen
+    geschrieben; der Index enthält trotzdem den vollständigen Snapshot.
     """
     f = Forge()
     f.ensure_repo()
@@ -403,8 +930,10 @@ def back(message):
     matches.sort(reverse=True)
     chosen_time, chosen_hash, chosen_data = matches[0]
 
-    # Wiederherstellen der Dateien aus dem Commit
-    for rel_path, obj_hash in chosen_data.get('files', {}).items():
+    # Wiederherstellen der Dateien aus dem Commit (nur innerhalb von .forge/sparse)
+    files = chosen_data.get('files', {})
+    for rel_path in f.scope().select(sorted(files)):
+        obj_hash = files[rel_path]
         obj_file = os.path.join(f.objects_path, obj_hash)
         if not os.path.exists(obj_file):
             secho(f"[Forge] >> Objekt {obj_hash} für {rel_path} fehlt.", fg="red")
@@ -413,8 +942,10 @@ def back(message):
         dir_name = os.path.dirname(abs_path)
         if dir_name and not os.path.exists(dir_name):
             os.makedirs(dir_name, exist_ok=True)
-        with open(obj_file, 'rb') as o, open(abs_path, 'wb') as out:
-            out.write(o.read())
+        data = f._read_object(obj_hash)
+        with phase('file.write'):
+            with open(abs_path, 'wb') as out:
+                out.write(data)
 
     # Index aktualisieren und HEAD setzen
     f._save_index(chosen_data.get('files', {}))
@@ -422,8 +953,13 @@ def back(message):
     secho(f"[Forge] >> Repository auf Snapshot {chosen_hash[:7]} ('{chosen_data.get('message', '')}') zurückgesetzt.", fg="green", bold=True)
 
 @cli.command()
-def log():
-    """Listet die Commit-Historie entlang von HEAD (jüngster zuerst)."""
+@click.option('--porcelain', is_flag=True, help='Stabiles, maschinenlesbares Format ohne Farben')
+def log(porcelain):
+    """Listet die Commit-Historie entlang von HEAD (jüngster zuerst).
+
+    Mit `--porcelain` wird pro Commit eine tab-getrennte Zeile
+    `<Hash> <Zeit> <Nachricht>` mit vollem Hash und ohne Überschrift ausgegeben.
+    """
     f = Forge()
     f.ensure_repo()
     head = f._read_head()
@@ -439,51 +975,67 @@ def log():
         chain.append((current, data))
         current = data.get('parent')
 
+    if porcelain:
+        with Output(porcelain=True) as out:
+            for c_hash, data in chain:
+                message = data.get('message', '').replace('\n', ' ')
+                out.line(f"{c_hash}\t{data.get('timestamp', '')}\t{message}", force=True)
+        return
+
     if not chain:
         # Fallback: keine HEAD gesetzt, zeige vorhandene Commits unsortiert
         commits = os.listdir(f.commits_path) if os.path.exists(f.commits_path) else []
         if not commits:
             secho("[Forge] >> Keine Snapshots vorhanden.", fg="red", bold=True)
             return
-        secho("--- Snapshots (unsortiert) ---", fg="green")
-        for c_hash in sorted(commits, reverse=True):
-            data = f._read_commit(c_hash)
-            if not data:
-                continue
-            secho(f"[{c_hash[:7]}] {data.get('timestamp','?')} | {data.get('message','')}" , fg="blue", bold=True)
+        with Output() as out:
+            out.line("--- Snapshots (unsortiert) ---", fg="green")
+            for c_hash in sorted(commits, reverse=True):
+                data = f._read_commit(c_hash)
+                if not data:
+                    continue
+                out.line(f"[{c_hash[:7]}] {data.get('timestamp','?')} | {data.get('message','')}" , fg="blue", bold=True)
         return
 
-    secho("--- Historie (HEAD → …) ---", fg="green", bold=True)
-    for c_hash, data in chain:
-        secho(f"[{c_hash[:7]}] {data.get('timestamp','?')} | {data.get('message','')}", fg="blue", bold=True)
+    with Output() as out:
+        out.line("--- Historie (HEAD → …) ---", fg="green", bold=True)
+        for c_hash, data in chain:
+            out.line(f"[{c_hash[:7]}] {data.get('timestamp','?')} | {data.get('message','')}", fg="blue", bold=True)
 
 @cli.command()
 @click.argument('name', required=False)
 @click.argument('commit', required=False)
 @click.option('-d', '--delete', is_flag=True, help='Lösche einen Tag')
 @click.option('-l', '--list', 'list_tags', is_flag=True, help='Zeige alle Tags')
-def tag(name, commit, delete, list_tags):
+@click.option('--porcelain', is_flag=True, help='Liste tab-getrennt als `<Name> <Hash>` ohne Farben')
+def tag(name, commit, delete, list_tags, porcelain):
     """Erzeuge, lösche oder zeige Tags (Release-Tags).
 
-    Ohne Optionen listet `tag` alle vorhandenen Tags. Mit `name` wird ein Tag
-    erstellt, standardmäßig auf den aktuellen HEAD.
+    Ohne Optionen (oder mit `-l`) listet `tag` alle vorhandenen Tags. Mit `name` wird ein Tag
+    erstellt, standardmäßig auf den aktuellen HEAD. `commit` darf ein Kurz-Hash,
+    Tag, Branch oder `HEAD~N` sein und wird vor dem Speichern aufgelöst.
     """
     f = Forge()
     f.ensure_repo()
     os.makedirs(f.tags_path, exist_ok=True)
-    if list_tags:
+    # --porcelain only changes the list format, never the action
+    if list_tags or (not name and not delete):
         tags = sorted(os.listdir(f.tags_path))
-        if not tags:
+        if not tags and not porcelain:
             secho("Keine Tags vorhanden.", fg='yellow')
             return
-        for t in tags:
-            path = os.path.join(f.tags_path, t)
-            try:
-                with open(path, 'r', encoding='utf-8') as fh:
-                    h = fh.read().strip()
-            except Exception:
-                h = '?'
-            secho(f"{t} -> {h}")
+        with Output(porcelain=porcelain) as out:
+            for t in tags:
+                path = os.path.join(f.tags_path, t)
+                try:
+                    with open(path, 'r', encoding='utf-8') as fh:
+                        h = fh.read().strip()
+                except Exception:
+                    h = '?'
+                if porcelain:
+                    out.line(f"{t}\t{h}", force=True)
+                else:
+                    out.line(f"{t} -> {h}")
         return
     if delete:
         if not name:
@@ -497,10 +1049,12 @@ def tag(name, commit, delete, list_tags):
             secho(f"Tag '{name}' nicht gefunden.", fg='yellow')
         return
     # create tag
-    if not name:
-        secho('Bitte Tag-Namen angeben.', fg='red')
-        return
-    target = commit or f._read_head()
+    if commit:
+        target = _resolve_or_report(f, commit)
+        if not target:
+            return
+    else:
+        target = f._read_head()
     if not target:
         secho('Kein Ziel-Commit (HEAD) vorhanden.', fg='red')
         return
@@ -682,6 +1236,43 @@ def rm(cached, paths):
     secho(f"[Forge] >> {removed} Pfad(e) entfernt.", fg='green', bold=True)
 
 
+@cli.command()
+@click.argument('prefixes', nargs=-1, type=click.Path())
+@click.option('-a', '--add', 'add_mode', is_flag=True, help='Präfixe ergänzen statt ersetzen')
+@click.option('--clear', is_flag=True, help='Sparse-Modus beenden (ganzer Baum)')
+def sparse(prefixes, add_mode, clear):
+    """Begrenzt Arbeitsbaum-Operationen auf ausgewählte Verzeichnisse.
+
+    Die Präfixe stehen zeilenweise in `.forge/sparse`. `add --all`, `status`,
+    `diff`, `restore` und `back` durchsuchen und schreiben nur Pfade darunter.
+    Ohne Argumente werden die aktuellen Präfixe angezeigt.
+    """
+    f = Forge()
+    f.ensure_repo()
+    if clear:
+        if os.path.exists(f.sparse_path):
+            os.remove(f.sparse_path)
+        secho("[Forge] >> Sparse-Modus beendet.", fg='green')
+        return
+    current = f._read_sparse()
+    if not prefixes:
+        if not current:
+            secho("Kein Sparse-Modus aktiv (ganzer Baum).", fg='yellow')
+            return
+        with Output() as out:
+            out.lines(current, force=True)
+        return
+    rels = [f._relpath(p) for p in prefixes]
+    if any(rel in ('.', '..') or rel.startswith('../') or os.path.isabs(rel) for rel in rels):
+        secho("[Forge] >> Präfixe müssen innerhalb des Repositorys liegen.", fg='red')
+        return
+    new = (current if add_mode else []) + rels
+    spec = PathSpec(new)
+    with open(f.sparse_path, 'w', encoding='utf-8') as fh:
+        fh.write(''.join(p + '\n' for p in spec.prefixes))
+    secho(f"[Forge] >> Sparse-Präfixe gesetzt: {', '.join(spec.prefixes)}", fg='green')
+
+
 def _is_text_bytes(b: bytes) -> bool:
     try:
         b.decode('utf-8')
@@ -694,21 +1285,27 @@ def _is_text_bytes(b: bytes) -> bool:
 @click.option('--all', 'restore_all', is_flag=True, help='Alle indexierten Dateien wiederherstellen')
 @click.argument('paths', nargs=-1, type=click.Path())
 def restore(restore_all, paths):
-    """Stellt Dateien aus dem Index wieder her (aus Objekten)."""
+    """Stellt Dateien aus dem Index wieder her (aus Objekten).
+
+    `paths` dürfen Dateien oder Verzeichnisse sein. Pfade außerhalb von
+    `.forge/sparse` werden nicht wiederhergestellt.
+    """
     f = Forge()
     f.ensure_repo()
     index = f._get_index()
 
-    targets = []
+    keys = sorted(index)
     if restore_all or not paths:
-        targets = list(index.keys())
+        targets = f.scope().select(keys)
     else:
+        sparse = f.scope()
         for p in paths:
             rel = f._relpath(p)
-            if rel in index:
-                targets.append(rel)
-            else:
+            if not PathSpec([rel]).select(keys):
                 secho(f"[Forge] >> {rel} nicht im Index.", fg='yellow')
+            elif not sparse.intersect(PathSpec([rel])).select(keys):
+                secho(f"[Forge] >> {rel} liegt außerhalb von .forge/sparse, übersprungen (siehe 'forge sparse').", fg='yellow')
+        targets = f.scope(paths).select(keys)
 
     restored = 0
     for rel in targets:
@@ -721,8 +1318,10 @@ def restore(restore_all, paths):
             continue
         abs_path = f._abspath(rel)
         os.makedirs(os.path.dirname(abs_path) or '.', exist_ok=True)
-        with open(obj_file, 'rb') as src, open(abs_path, 'wb') as dst:
-            dst.write(src.read())
+        data = f._read_object(obj_hash)
+        with phase('file.write'):
+            with open(abs_path, 'wb') as dst:
+                dst.write(data)
         restored += 1
     secho(f"[Forge] >> {restored} Datei(en) wiederhergestellt.", fg='green', bold=True)
 
@@ -730,11 +1329,19 @@ def restore(restore_all, paths):
 @cli.command()
 @click.argument('paths', nargs=-1, type=click.Path())
 def diff(paths):
-    """Zeigt Unterschiede zwischen Arbeitsverzeichnis und Index."""
+    """Zeigt Unterschiede zwischen Arbeitsverzeichnis und Index.
+
+    `paths` dürfen Dateien oder Verzeichnisse sein; ohne Angabe wird der ganze
+    (Sparse-)Baum verglichen.
+    """
     f = Forge()
     f.ensure_repo()
     index = f._get_index()
 
+    def unified(a, b, rel):
+        # Stream hunks line by line instead of joining the whole diff first
+        out.lines(difflib.unified_diff(a, b, fromfile=f"a/{rel}", tofile=f"b/{rel}", lineterm=''), force=True)
+
     def show_diff_for(rel):
         abs_path = f._abspath(rel)
         obj_hash = index.get(rel)
@@ -745,63 +1352,50 @@ def diff(paths):
             with open(abs_path, 'rb') as fh:
                 b = fh.read()
             if not _is_text_bytes(b):
-                secho(f"Binary file {rel} differs (untracked)", fg='yellow')
+                out.line(f"Binary file {rel} differs (untracked)", fg='yellow')
                 return
-            text = b.decode('utf-8', errors='replace').splitlines(keepends=False)
-            ud = difflib.unified_diff([], text, fromfile=f"a/{rel}", tofile=f"b/{rel}")
-            click.echo('\n'.join(ud))
+            unified([], b.decode('utf-8', errors='replace').splitlines(keepends=False), rel)
             return
         obj_file = os.path.join(f.objects_path, obj_hash)
         if not os.path.exists(obj_file):
-            secho(f"[Forge] >> Objekt {obj_hash} fehlt für {rel}.", fg='red')
+            out.line(f"[Forge] >> Objekt {obj_hash} fehlt für {rel}.", fg='red')
             return
-        with open(obj_file, 'rb') as fh:
-            ob = fh.read()
+        ob = f._read_object(obj_hash)
         if not os.path.exists(abs_path):
             # deleted in working tree
             if _is_text_bytes(ob):
-                a = ob.decode('utf-8', errors='replace').splitlines(False)
-                ud = difflib.unified_diff(a, [], fromfile=f"a/{rel}", tofile=f"b/{rel}")
-                click.echo('\n'.join(ud))
+                unified(ob.decode('utf-8', errors='replace').splitlines(False), [], rel)
             else:
-                secho(f"Binary file {rel} deleted", fg='yellow')
+                out.line(f"Binary file {rel} deleted", fg='yellow')
             return
         with open(abs_path, 'rb') as fh:
             wb = fh.read()
+        if ob == wb:
+            return
         if not _is_text_bytes(ob) or not _is_text_bytes(wb):
-            if ob != wb:
-                secho(f"Binary file {rel} differs", fg='yellow')
+            out.line(f"Binary file {rel} differs", fg='yellow')
             return
         a = ob.decode('utf-8', errors='replace').splitlines(False)
         b = wb.decode('utf-8', errors='replace').splitlines(False)
         if a == b:
             return
-        ud = difflib.unified_diff(a, b, fromfile=f"a/{rel}", tofile=f"b/{rel}")
-        click.echo('\n'.join(ud))
+        unified(a, b, rel)
 
-    if paths:
-        rels = [f._relpath(p) for p in paths]
-    else:
-        # default: all indexed files
-        rels = sorted(set(list(index.keys())))
-        # plus untracked files
-        for root, dirs, files in os.walk(os.getcwd()):
-            if f.base_path in root:
-                continue
-            dirs[:] = [d for d in dirs if os.path.join(root, d) != os.path.abspath(f.base_path)]
-            for name in files:
-                p = os.path.join(root, name)
-                if f.base_path in p:
-                    continue
-                rels.append(f._relpath(p))
-        rels = sorted(set(rels))
+    # indexed files plus untracked files, limited to sparse prefixes and `paths`
+    scope = f.scope(paths)
+    rels = scope.select(sorted(index))
+    for p in f._walk_worktree(scope=scope):
+        rels.append(f._relpath(p))
+    rels = sorted(set(rels))
 
-    for rel in rels:
-        show_diff_for(rel)
+    with Output() as out:
+        for rel in rels:
+            with phase('diff'):
+                show_diff_for(rel)
 
 
 @cli.command()
-@click.option('--object', 'object_hash', help='Objekt-Hash anzeigen')
+@click.option('--object', 'object_hash', help='Objekt-Hash (auch abgekürzt) anzeigen')
 @click.option('--path', 'path_arg', type=click.Path(), help='Inhalt eines indexierten Pfads anzeigen')
 def show(object_hash, path_arg):
     """Zeigt Inhalt eines Objekts oder eines indexierten Pfads (Textdateien)."""
@@ -810,12 +1404,14 @@ def show(object_hash, path_arg):
     index = f._get_index()
 
     if object_hash:
-        obj_file = os.path.join(f.objects_path, object_hash)
+        resolved = _resolve_or_report(f, object_hash, kind='object')
+        if not resolved:
+            return
+        obj_file = os.path.join(f.objects_path, resolved)
         if not os.path.exists(obj_file):
             secho(f"[Forge] >> Objekt {object_hash} nicht gefunden.", fg='red')
             return
-        with open(obj_file, 'rb') as fh:
-            b = fh.read()
+        b = f._read_object(resolved)
         if _is_text_bytes(b):
             click.echo(b.decode('utf-8', errors='replace'))
         else:
@@ -831,3 +1427,460 @@ def show(object_hash, path_arg):
         return show.callback(object_hash=obj_hash, path_arg=None)  # reuse
 
     secho("[Forge] >> Bitte --object HASH oder --path DATEI angeben.", fg='yellow')
+
+
+@cli.command()
+@click.option('--prune', is_flag=True, help='Unerreichbare Objekte tatsächlich löschen')
+@click.option('--expire', type=click.FLOAT, default=14.0, show_default=True,
+              help='Schonfrist in Tagen: jüngere unerreichbare Dateien bleiben erhalten')
+def gc(prune, expire):
+    """Räumt unerreichbare Objekte auf.
+
+    Markiert alle Objekte, die von einem Commit oder dem Index referenziert
+    werden, und entfernt mit `--prune` den Rest, sofern er älter als die
+    Schonfrist ist. Commits selbst werden nie gelöscht, da `back` jeden Commit
+    über seine Nachricht findet. Ohne `--prune` wird nur angezeigt, was
+    gelöscht würde.
+    """
+    f = Forge()
+    f.ensure_repo()
+    try:
+        reachable = f._mark_reachable()
+    except ValueError as e:
+        secho(f"[Forge] >> {e}", fg='red', force=True)
+        secho("[Forge] >> Abgebrochen: Erreichbarkeit unklar, es wird nichts gelöscht. Prüfe mit 'forge fsck'.",
+              fg='red', bold=True, force=True)
+        exit(1)
+    cutoff = datetime.now().timestamp() - expire * 86400
+
+    removed = 0
+    kept_recent = 0
+    reclaimed = 0
+    with os.scandir(f.objects_path) as entries:
+        for entry in entries:
+            if entry.name in reachable or not entry.is_file(follow_symlinks=False):
+                continue
+            st = entry.stat(follow_symlinks=False)
+            # ctime as well as mtime: pull copies with copy2, which keeps the old mtime
+            if max(st.st_mtime, st.st_ctime) > cutoff:
+                kept_recent += 1
+                continue
+            if prune:
+                try:
+                    os.remove(entry.path)
+                except OSError as e:
+                    secho(f"[Forge] >> Konnte {entry.path} nicht löschen: {e}", fg='red')
+                    continue
+            removed += 1
+            reclaimed += st.st_size
+
+    verb = 'entfernt' if prune else 'würden entfernt (mit --prune)'
+    secho(f"[Forge] >> {removed} unerreichbare Datei(en) {verb}, {reclaimed} Bytes.", fg='green', bold=True)
+    if kept_recent:
+        secho(f"[Forge] >> {kept_recent} unerreichbare Datei(en) jünger als {expire:g} Tag(e) behalten.", fg='yellow')
+
+
+def _fsck_object(f: Forge, name: str):
+    """Re-hash one object file; return an error entry or None."""
+    try:
+        actual = f._hash_path(os.path.join(f.objects_path, name))
+    except OSError as e:
+        return {"kind": "unreadable-object", "hash": name, "detail": str(e)}
+    if actual != name:
+        return {"kind": "hash-mismatch", "hash": name, "detail": f"content hashes to {actual}"}
+    return None
+
+
+@cli.command()
+@click.option('--json', 'as_json', is_flag=True, help='Bericht als JSON ausgeben')
+@click.option('--incremental', is_flag=True, help='Nur seit dem letzten erfolgreichen Lauf hinzugekommene Dateien prüfen')
+@click.option('-j', '--jobs', type=click.IntRange(min=1), default=None, help='Anzahl paralleler Prüf-Threads')
+def fsck(as_json, incremental, jobs):
+    """Prüft die Integrität von Objekten, Commits und Referenzen.
+
+    Jedes Objekt wird neu gehasht und mit seinem Namen verglichen. Commits
+    werden auf gültige Hashes, vorhandene Eltern und vorhandene Datei-Objekte
+    geprüft, ebenso HEAD, Branches, Tags und der Index.
+    """
+    f = Forge()
+    f.ensure_repo()
+    state_path = os.path.join(f.base_path, 'fsck-state')
+    started = datetime.now().timestamp()
+    since = 0
+    if incremental:
+        try:
+            state = f._read_json(state_path, {})
+        except (OSError, ValueError):
+            state = None
+        since = state.get('last_success') if isinstance(state, dict) else None
+        if not isinstance(since, (int, float)):
+            # unreadable state: fall back to a full run
+            secho("[Forge] >> fsck-state unlesbar, prüfe alles.", fg='yellow', err=True)
+            since = 0
+
+    def changed_since(folder):
+        # ctime as well as mtime: pull copies with copy2, which keeps the old mtime
+        names = []
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                # only hash-named entries; temp files of interrupted transfers are left to gc
+                if not _valid_name(entry.name) or not entry.is_file(follow_symlinks=False):
+                    continue
+                st = entry.stat(follow_symlinks=False)
+                if max(st.st_mtime, st.st_ctime) >= since:
+                    names.append(entry.name)
+        return sorted(names)
+
+    errors = []
+    objects = changed_since(f.objects_path)
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for err in pool.map(lambda name: _fsck_object(f, name), objects):
+            if err:
+                errors.append(err)
+
+    def object_exists(h):
+        return os.path.isfile(os.path.join(f.objects_path, h))
+
+    def commit_exists(h):
+        return os.path.isfile(os.path.join(f.commits_path, h))
+
+    commits = changed_since(f.commits_path)
+    for c_hash in commits:
+        try:
+            data = f._read_commit(c_hash)
+        except (OSError, ValueError) as e:
+            errors.append({"kind": "unreadable-commit", "hash": c_hash, "detail": str(e)})
+            continue
+        if not isinstance(data, dict):
+            errors.append({"kind": "unreadable-commit", "hash": c_hash, "detail": "not a JSON object"})
+            continue
+        problem = _commit_problem(data)
+        if problem:
+            errors.append({"kind": "invalid-commit", "hash": c_hash, "detail": problem})
+            continue
+        actual = hashlib.sha1(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()
+        if actual != c_hash:
+            errors.append({"kind": "hash-mismatch", "hash": c_hash, "detail": f"commit hashes to {actual}"})
+        parent = data.get('parent')
+        if parent and not commit_exists(parent):
+            errors.append({"kind": "missing-parent", "hash": c_hash, "detail": parent})
+        for rel, obj_hash in data.get('files', {}).items():
+            if not object_exists(obj_hash):
+                errors.append({"kind": "missing-object", "hash": c_hash, "detail": f"{rel} -> {obj_hash}"})
+
+    # Refs are checked with the resolver's expansion, so short-hash tags it accepts are valid here too
+    refs = f._refs()
+    for ref, target in refs:
+        try:
+            if not target:
+                raise ResolveError(f"Referenz {ref} ist leer.")
+            f._expand_hash(target, f.commits_path, f"{ref} -> {target}")
+        except ResolveError as e:
+            errors.append({"kind": "dangling-ref", "hash": target, "detail": str(e)})
+    for rel, obj_hash in f._get_index().items():
+        if not object_exists(obj_hash):
+            errors.append({"kind": "missing-object", "hash": None, "detail": f"index: {rel} -> {obj_hash}"})
+
+    report = {
+        "ok": not errors,
+        "incremental": incremental,
+        "checked": {"objects": len(objects), "commits": len(commits), "refs": len(refs)},
+        "errors": errors,
+    }
+    if not errors:
+        f._write_json(state_path, {"last_success": started})
+
+    if as_json:
+        click.echo(json.dumps(report, indent=2))
+    else:
+        for err in errors:
+            secho(f"[Forge] >> {err['kind']}: {err['hash'] or '-'} {err['detail']}", fg='red', force=True)
+        checked = report['checked']
+        summary = f"{checked['objects']} Objekt(e), {checked['commits']} Commit(s), {checked['refs']} Referenz(en) geprüft"
+        if errors:
+            secho(f"[Forge] >> {summary}: {len(errors)} Fehler.", fg='red', bold=True, force=True)
+        else:
+            secho(f"[Forge] >> {summary}: keine Fehler.", fg='green', bold=True)
+    if errors:
+        exit(1)
+
+
+# --- Netzwerk-Remote: forge serve / forge:// ---
+#
+# Every message is a 4-byte big-endian length followed by a UTF-8 JSON body.
+# The side that has the data sends an inventory, the other side answers with
+# the names it wants, and the data side streams a pack: one header message
+# {"kind", "name", "size"} followed by `size` raw bytes per entry, terminated
+# by {"end": true}. All file I/O runs in worker threads.
+
+PROTOCOL_VERSION = 1
+DEFAULT_PORT = 9420
+MAX_MESSAGE = 1 << 28
+_PACK_KINDS = ('objects', 'commits')
+
+
+def _parse_remote_url(url: str):
+    """`forge://host:port` -> ('tcp', host, port), `forge+unix:///path` -> ('unix', path, None).
+
+    Returns None for anything else, which push/pull treat as a directory.
+    """
+    if url.startswith('forge+unix://'):
+        return ('unix', url[len('forge+unix://'):], None)
+    if url.startswith('forge://'):
+        netloc = url[len('forge://'):].rstrip('/')
+        host, sep, port = netloc.rpartition(':')
+        if not sep or not port.isdigit():
+            host, port = netloc, DEFAULT_PORT
+        return ('tcp', host.strip('[]') or '127.0.0.1', int(port))
+    return None
+
+
+def _valid_name(name) -> bool:
+    return isinstance(name, str) and len(name) == HASH_LEN and _is_hex(name)
+
+
+async def _send_msg(writer, msg: dict):
+    body = json.dumps(msg).encode('utf-8')
+    writer.write(len(body).to_bytes(4, 'big') + body)
+    await writer.drain()
+
+
+async def _recv_msg(reader) -> dict:
+    size = int.from_bytes(await reader.readexactly(4), 'big')
+    if size > MAX_MESSAGE:
+        raise ValueError(f"Nachricht zu groß ({size} Bytes)")
+    msg = json.loads(await reader.readexactly(size))
+    if not isinstance(msg, dict):
+        raise ValueError("Ungültige Nachricht")
+    if msg.get('error'):
+        raise ConnectionError(msg['error'])
+    return msg
+
+
+def _pack_lists(msg: dict, key: str) -> dict:
+    """`msg[key]` as `{kind: [name, ...]}`; raises ValueError for any other shape."""
+    value = msg.get(key, {})
+    if not isinstance(value, dict):
+        raise ValueError(f"Ungültige Nachricht: '{key}' ist kein Objekt")
+    for kind in _PACK_KINDS:
+        names = value.get(kind, [])
+        if not isinstance(names, list) or not all(isinstance(n, str) for n in names):
+            raise ValueError(f"Ungültige Nachricht: '{key}.{kind}' ist keine Liste von Hashes")
+    return value
+
+
+async def _inventory(f: Forge) -> dict:
+    return {kind: await asyncio.to_thread(f._sorted_hashes, os.path.join(f.base_path, kind))
+            for kind in _PACK_KINDS}
+
+
+def _missing(inventory: dict, local: dict) -> dict:
+    """Names in the peer's `inventory` that are not in `local`."""
+    want = {}
+    for kind in _PACK_KINDS:
+        have = set(local[kind])
+        want[kind] = [n for n in inventory.get(kind, []) if _valid_name(n) and n not in have]
+    return want
+
+
+async def _send_pack(writer, f: Forge, want: dict) -> int:
+    """Stream the requested entries; `drain` after every chunk applies backpressure."""
+    sent = 0
+    for kind in _PACK_KINDS:
+        folder = os.path.join(f.base_path, kind)
+        for name in want.get(kind, []):
+            if not _valid_name(name):
+                continue
+            try:
+                fh = await asyncio.to_thread(open, os.path.join(folder, name), 'rb')
+            except FileNotFoundError:
+                continue
+            try:
+                size = os.fstat(fh.fileno()).st_size
+                await _send_msg(writer, {"kind": kind, "name": name, "size": size})
+                while chunk := await asyncio.to_thread(fh.read, CHUNK_SIZE):
+                    writer.write(chunk)
+                    await writer.drain()
+            finally:
+                await asyncio.to_thread(fh.close)
+            sent += 1
+    await _send_msg(writer, {"end": True})
+    return sent
+
+
+def _commit_hash_of(data: bytes) -> str:
+    return hashlib.sha1(json.dumps(json.loads(data), sort_keys=True).encode('utf-8')).hexdigest()
+
+
+async def _recv_pack(reader, f: Forge):
+    """Receive a pack into `f`, verifying every hash; returns `(received, errors)`."""
+    received = {kind: 0 for kind in _PACK_KINDS}
+    errors = []
+    while True:
+        header = await _recv_msg(reader)
+        if header.get('end'):
+            return received, errors
+        kind, name, size = header.get('kind'), header.get('name'), header.get('size')
+        if kind not in _PACK_KINDS or not _valid_name(name) or not isinstance(size, int) or size < 0:
+            raise ValueError(f"Ungültiger Pack-Eintrag: {header}")
+        folder = os.path.join(f.base_path, kind)
+        final = os.path.join(folder, name)
+        tmp = f"{final}.tmp-{os.getpid()}-{os.urandom(4).hex()}"
+        h = hashlib.sha1()
+        body = bytearray() if kind == 'commits' else None
+        fh = await asyncio.to_thread(open, tmp, 'wb')
+        try:
+            remaining = size
+            while remaining:
+                chunk = await reader.readexactly(min(remaining, CHUNK_SIZE))
+                remaining -= len(chunk)
+                h.update(chunk)
+                if body is not None:
+                    body += chunk
+                await asyncio.to_thread(fh.write, chunk)
+        except BaseException:
+            await asyncio.to_thread(fh.close)
+            await asyncio.to_thread(os.remove, tmp)
+            raise
+        await asyncio.to_thread(fh.close)
+        try:
+            actual = _commit_hash_of(bytes(body)) if body is not None else h.hexdigest()
+        except ValueError:
+            actual = None
+        if actual != name:
+            await asyncio.to_thread(os.remove, tmp)
+            errors.append(f"{kind}/{name}: Hash stimmt nicht")
+            continue
+        await asyncio.to_thread(os.replace, tmp, final)
+        received[kind] += 1
+
+
+async def _serve_client(reader, writer):
+    f = Forge()
+    peer = writer.get_extra_info('peername') or 'unix'
+    try:
+        hello = await _recv_msg(reader)
+        if hello.get('version') != PROTOCOL_VERSION:
+            await _send_msg(writer, {"error": f"Protokollversion {hello.get('version')} nicht unterstützt"})
+            return
+        if hello.get('op') == 'pull':
+            await _send_msg(writer, {"inventory": await _inventory(f)})
+            want = _pack_lists(await _recv_msg(reader), 'want')
+            await _send_pack(writer, f, want)
+        elif hello.get('op') == 'push':
+            inventory = _pack_lists(await _recv_msg(reader), 'inventory')
+            want = _missing(inventory, await _inventory(f))
+            await _send_msg(writer, {"want": want})
+            received, errors = await _recv_pack(reader, f)
+            await _send_msg(writer, {"received": received, "errors": errors})
+        else:
+            await _send_msg(writer, {"error": f"Unbekannte Operation {hello.get('op')!r}"})
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError, OSError) as e:
+        secho(f"[Forge] >> Verbindung {peer}: {e}", fg='red', err=True)
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+
+async def _open_remote(remote):
+    scheme, address, port = remote
+    if scheme == 'unix':
+        return await asyncio.open_unix_connection(address)
+    return await asyncio.open_connection(address, port)
+
+
+async def _remote_transfer(f: Forge, remote, op: str):
+    """Client side of push/pull; returns `(transferred per kind, errors)`."""
+    reader, writer = await _open_remote(remote)
+    try:
+        await _send_msg(writer, {"op": op, "version": PROTOCOL_VERSION})
+        if op == 'push':
+            await _send_msg(writer, {"inventory": await _inventory(f)})
+            want = _pack_lists(await _recv_msg(reader), 'want')
+            await _send_pack(writer, f, want)
+            result = await _recv_msg(reader)
+            received, errors = result.get('received', {}), result.get('errors', [])
+            if (not isinstance(received, dict)
+                    or not all(isinstance(received.get(kind, 0), int) for kind in _PACK_KINDS)
+                    or not isinstance(errors, list) or not all(isinstance(e, str) for e in errors)):
+                raise ValueError("Ungültige Antwort auf push")
+            return received, errors
+        inventory = _pack_lists(await _recv_msg(reader), 'inventory')
+        await _send_msg(writer, {"want": _missing(inventory, await _inventory(f))})
+        return await _recv_pack(reader, f)
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+
+def _remote_sync(f: Forge, remote, op: str) -> bool:
+    try:
+        received, errors = asyncio.run(_remote_transfer(f, remote, op))
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError, OSError) as e:
+        secho(f"[Forge] >> Remote-Fehler: {e}", fg='red', bold=True, force=True)
+        return False
+    for err in errors:
+        secho(f"[Forge] >> {err}", fg='red', force=True)
+    secho(f"[Forge] >> {received.get('objects', 0)} Objekt(e), {received.get('commits', 0)} Commit(s) übertragen.",
+          fg='green' if not errors else 'yellow', bold=True)
+    return not errors
+
+
+@cli.command()
+@click.option('--host', default='127.0.0.1', show_default=True, help='TCP-Adresse zum Lauschen')
+@click.option('--port', type=click.IntRange(0, 65535), default=DEFAULT_PORT, show_default=True, help='TCP-Port (0 = beliebig)')
+@click.option('--unix', 'unix_path', type=click.Path(), help='Unix-Socket statt TCP verwenden')
+def serve(host, port, unix_path):
+    """Stellt dieses Repository für `push`/`pull` über `forge://` bereit.
+
+    Läuft, bis er mit Strg+C beendet wird. Viele Clients werden gleichzeitig
+    bedient; Dateizugriffe laufen in Worker-Threads.
+    """
+    f = Forge()
+    f.ensure_repo()
+
+    created_socket = None  # (st_dev, st_ino) of the socket this process bound
+
+    async def main():
+        nonlocal created_socket
+        try:
+            if unix_path:
+                server = await asyncio.start_unix_server(_serve_client, path=unix_path)
+                st = os.stat(unix_path)
+                created_socket = (st.st_dev, st.st_ino)
+                address = f"forge+unix://{os.path.abspath(unix_path)}"
+            else:
+                server = await asyncio.start_server(_serve_client, host, port)
+                bound = server.sockets[0].getsockname()
+                address = f"forge://{bound[0]}:{bound[1]}"
+        except OSError as e:
+            secho(f"[Forge] >> Server konnte nicht starten ({unix_path or f'{host}:{port}'}): {e}",
+                  fg='red', bold=True, force=True)
+            return False
+        secho(f"[Forge] >> Bereit auf {address}", fg='green', bold=True, force=True)
+        async with server:
+            await server.serve_forever()
+        return True
+
+    started = True
+    try:
+        started = asyncio.run(main())
+    except KeyboardInterrupt:
+        secho("[Forge] >> Server beendet.", fg='yellow')
+    finally:
+        # Only remove the socket this process created, never a pre-existing file
+        if created_socket is not None:
+            try:
+                st = os.lstat(unix_path)
+            except FileNotFoundError:
+                st = None
+            if st is not None and stat.S_ISSOCK(st.st_mode) and (st.st_dev, st.st_ino) == created_socket:
+                os.remove(unix_path)
+    if not started:
+        exit(1)